@@ -7,14 +7,23 @@ import traceback
 # can be imported correctly, regardless of where you run the script from.
 sys.path.append(os.path.abspath('src'))
 
-# We import our core Engine class.
-from engine import Engine
+from runtime_config import select_profile, apply_opengl_flags, StartupReport
 
 if __name__ == "__main__":
-    print("Initializing the PEACE Engine...")
+    startup_report = StartupReport()
     try:
+        # The profile has to be applied before the engine pulls in PyOpenGL, since
+        # PyOpenGL reads its error-checking flags at import time.
+        profile = select_profile(sys.argv[1:])
+        apply_opengl_flags(profile)
+
+        # We import our core Engine class.
+        from engine import Engine
+        startup_report.mark("imports")
+
+        print(f"Initializing the PEACE Engine ({profile.name} profile)...")
         # We create an instance of our engine with a specified window resolution.
-        peace_engine = Engine(1920, 1080)
+        peace_engine = Engine(1920, 1080, profile, startup_report)
         # We start the main loop of the engine.
         peace_engine.run()
     except Exception as e:
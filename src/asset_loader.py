@@ -2,8 +2,12 @@
 from OpenGL.GL import *
 import numpy as np
 from mesh import Mesh
+import lod
+from lod import LODMesh
 from pyrr import matrix44, Vector3, Vector4
 import math
+from functools import lru_cache
+import hashlib
 
 class Shader:
     def __init__(self, vertex_path, fragment_path):
@@ -72,23 +76,24 @@ def _calculate_tangents_and_bitangents(vertices):
         
     return np.array(final_vertices, dtype=np.float32)
 
+_CUBE_VERTICES = [
+    # pos              # normal           # uv
+    [-0.5, -0.5, -0.5,  0.0,  0.0, -1.0,  0.0, 0.0], [ 0.5, -0.5, -0.5,  0.0,  0.0, -1.0,  1.0, 0.0], [ 0.5,  0.5, -0.5,  0.0,  0.0, -1.0,  1.0, 1.0],
+    [ 0.5,  0.5, -0.5,  0.0,  0.0, -1.0,  1.0, 1.0], [-0.5,  0.5, -0.5,  0.0,  0.0, -1.0,  0.0, 1.0], [-0.5, -0.5, -0.5,  0.0,  0.0, -1.0,  0.0, 0.0],
+    [-0.5, -0.5,  0.5,  0.0,  0.0,  1.0,  0.0, 0.0], [ 0.5, -0.5,  0.5,  0.0,  0.0,  1.0,  1.0, 0.0], [ 0.5,  0.5,  0.5,  0.0,  0.0,  1.0,  1.0, 1.0],
+    [ 0.5,  0.5,  0.5,  0.0,  0.0,  1.0,  1.0, 1.0], [-0.5,  0.5,  0.5,  0.0,  0.0,  1.0,  0.0, 1.0], [-0.5, -0.5,  0.5,  0.0,  0.0,  1.0,  0.0, 0.0],
+    [-0.5,  0.5,  0.5, -1.0,  0.0,  0.0,  1.0, 0.0], [-0.5,  0.5, -0.5, -1.0,  0.0,  0.0,  1.0, 1.0], [-0.5, -0.5, -0.5, -1.0,  0.0,  0.0,  0.0, 1.0],
+    [-0.5, -0.5, -0.5, -1.0,  0.0,  0.0,  0.0, 1.0], [-0.5, -0.5,  0.5, -1.0,  0.0,  0.0,  0.0, 0.0], [-0.5,  0.5,  0.5, -1.0,  0.0,  0.0,  1.0, 0.0],
+    [ 0.5,  0.5,  0.5,  1.0,  0.0,  0.0,  1.0, 0.0], [ 0.5,  0.5, -0.5,  1.0,  0.0,  0.0,  1.0, 1.0], [ 0.5, -0.5, -0.5,  1.0,  0.0,  0.0,  0.0, 1.0],
+    [ 0.5, -0.5, -0.5,  1.0,  0.0,  0.0,  0.0, 1.0], [ 0.5, -0.5,  0.5,  1.0,  0.0,  0.0,  0.0, 0.0], [ 0.5,  0.5,  0.5,  1.0,  0.0,  0.0,  1.0, 0.0],
+    [-0.5, -0.5, -0.5,  0.0, -1.0,  0.0,  0.0, 1.0], [ 0.5, -0.5, -0.5,  0.0, -1.0,  0.0,  1.0, 1.0], [ 0.5, -0.5,  0.5,  0.0, -1.0,  0.0,  1.0, 0.0],
+    [ 0.5, -0.5,  0.5,  0.0, -1.0,  0.0,  1.0, 0.0], [-0.5, -0.5,  0.5,  0.0, -1.0,  0.0,  0.0, 0.0], [-0.5, -0.5, -0.5,  0.0, -1.0,  0.0,  0.0, 1.0],
+    [-0.5,  0.5, -0.5,  0.0,  1.0,  0.0,  0.0, 1.0], [ 0.5,  0.5, -0.5,  0.0,  1.0,  0.0,  1.0, 1.0], [ 0.5,  0.5,  0.5,  0.0,  1.0,  0.0,  1.0, 0.0],
+    [ 0.5,  0.5,  0.5,  0.0,  1.0,  0.0,  1.0, 0.0], [-0.5,  0.5,  0.5,  0.0,  1.0,  0.0,  0.0, 0.0], [-0.5,  0.5, -0.5,  0.0,  1.0,  0.0,  0.0, 1.0]
+]
+
 def load_cube_mesh() -> Mesh:
-    vertices = [
-        # pos              # normal           # uv
-        [-0.5, -0.5, -0.5,  0.0,  0.0, -1.0,  0.0, 0.0], [ 0.5, -0.5, -0.5,  0.0,  0.0, -1.0,  1.0, 0.0], [ 0.5,  0.5, -0.5,  0.0,  0.0, -1.0,  1.0, 1.0],
-        [ 0.5,  0.5, -0.5,  0.0,  0.0, -1.0,  1.0, 1.0], [-0.5,  0.5, -0.5,  0.0,  0.0, -1.0,  0.0, 1.0], [-0.5, -0.5, -0.5,  0.0,  0.0, -1.0,  0.0, 0.0],
-        [-0.5, -0.5,  0.5,  0.0,  0.0,  1.0,  0.0, 0.0], [ 0.5, -0.5,  0.5,  0.0,  0.0,  1.0,  1.0, 0.0], [ 0.5,  0.5,  0.5,  0.0,  0.0,  1.0,  1.0, 1.0],
-        [ 0.5,  0.5,  0.5,  0.0,  0.0,  1.0,  1.0, 1.0], [-0.5,  0.5,  0.5,  0.0,  0.0,  1.0,  0.0, 1.0], [-0.5, -0.5,  0.5,  0.0,  0.0,  1.0,  0.0, 0.0],
-        [-0.5,  0.5,  0.5, -1.0,  0.0,  0.0,  1.0, 0.0], [-0.5,  0.5, -0.5, -1.0,  0.0,  0.0,  1.0, 1.0], [-0.5, -0.5, -0.5, -1.0,  0.0,  0.0,  0.0, 1.0],
-        [-0.5, -0.5, -0.5, -1.0,  0.0,  0.0,  0.0, 1.0], [-0.5, -0.5,  0.5, -1.0,  0.0,  0.0,  0.0, 0.0], [-0.5,  0.5,  0.5, -1.0,  0.0,  0.0,  1.0, 0.0],
-        [ 0.5,  0.5,  0.5,  1.0,  0.0,  0.0,  1.0, 0.0], [ 0.5,  0.5, -0.5,  1.0,  0.0,  0.0,  1.0, 1.0], [ 0.5, -0.5, -0.5,  1.0,  0.0,  0.0,  0.0, 1.0],
-        [ 0.5, -0.5, -0.5,  1.0,  0.0,  0.0,  0.0, 1.0], [ 0.5, -0.5,  0.5,  1.0,  0.0,  0.0,  0.0, 0.0], [ 0.5,  0.5,  0.5,  1.0,  0.0,  0.0,  1.0, 0.0],
-        [-0.5, -0.5, -0.5,  0.0, -1.0,  0.0,  0.0, 1.0], [ 0.5, -0.5, -0.5,  0.0, -1.0,  0.0,  1.0, 1.0], [ 0.5, -0.5,  0.5,  0.0, -1.0,  0.0,  1.0, 0.0],
-        [ 0.5, -0.5,  0.5,  0.0, -1.0,  0.0,  1.0, 0.0], [-0.5, -0.5,  0.5,  0.0, -1.0,  0.0,  0.0, 0.0], [-0.5, -0.5, -0.5,  0.0, -1.0,  0.0,  0.0, 1.0],
-        [-0.5,  0.5, -0.5,  0.0,  1.0,  0.0,  0.0, 1.0], [ 0.5,  0.5, -0.5,  0.0,  1.0,  0.0,  1.0, 1.0], [ 0.5,  0.5,  0.5,  0.0,  1.0,  0.0,  1.0, 0.0],
-        [ 0.5,  0.5,  0.5,  0.0,  1.0,  0.0,  1.0, 0.0], [-0.5,  0.5,  0.5,  0.0,  1.0,  0.0,  0.0, 0.0], [-0.5,  0.5, -0.5,  0.0,  1.0,  0.0,  0.0, 1.0]
-    ]
-    return Mesh(_calculate_tangents_and_bitangents(vertices))
+    return Mesh(_calculate_tangents_and_bitangents(_CUBE_VERTICES))
 
 def load_quad_mesh() -> Mesh:
     vertices = [
@@ -97,7 +102,8 @@ def load_quad_mesh() -> Mesh:
     ]
     return Mesh(_calculate_tangents_and_bitangents(vertices))
 
-def load_sphere_mesh(radius=1.0, sectors=36, stacks=18) -> Mesh:
+@lru_cache(maxsize=None)
+def _sphere_vertex_data(radius: float, sectors: int, stacks: int) -> np.ndarray:
     sphere_vertices = []
     for i in range(stacks + 1):
         stack_angle = math.pi / 2 - i * math.pi / stacks
@@ -121,5 +127,67 @@ def load_sphere_mesh(radius=1.0, sectors=36, stacks=18) -> Mesh:
     unindexed_vertices = []
     for index in indices:
         unindexed_vertices.append(sphere_vertices[index])
-        
-    return Mesh(_calculate_tangents_and_bitangents(unindexed_vertices))
\ No newline at end of file
+
+    # The array is shared by every caller with the same parameters, so guard it against edits.
+    vertex_data = _calculate_tangents_and_bitangents(unindexed_vertices)
+    vertex_data.setflags(write=False)
+    return vertex_data
+
+def load_sphere_mesh(radius=1.0, sectors=36, stacks=18) -> Mesh:
+    return Mesh(_sphere_vertex_data(radius, sectors, stacks))
+
+# Built chains are shared by every object that asks for the same parameters, so
+# the GPU buffers exist once. A chain is rebuilt if it has been destroyed.
+_lod_chains = {}
+
+def _check_lod_parameters(levels: int, thresholds) -> None:
+    if levels < 1:
+        raise ValueError("An LOD chain needs at least one level.")
+    if thresholds is not None and len(thresholds) < levels - 1:
+        raise ValueError(f"{levels} LOD levels need {levels - 1} thresholds, got {len(thresholds)}.")
+
+def _cached_lod_chain(key, build_meshes, thresholds) -> LODMesh:
+    chain = _lod_chains.get(key)
+    if chain is None or not chain.meshes:
+        meshes = build_meshes()
+        level_thresholds = list(thresholds[:len(meshes) - 1]) if thresholds is not None else lod.default_thresholds(len(meshes))
+        chain = _lod_chains[key] = LODMesh(meshes, level_thresholds)
+    return chain
+
+def load_sphere_lod(radius=1.0, sectors=36, stacks=18, levels=4, thresholds=None) -> LODMesh:
+    """
+    Builds an LOD chain for a sphere by halving the sectors and stacks at each level,
+    stopping early once the tessellation cannot get any coarser. The chain is
+    memoized by its parameters. Without explicit thresholds, lod.default_thresholds
+    is used for the levels actually built.
+    """
+    _check_lod_parameters(levels, thresholds)
+    def build_meshes():
+        tessellations = [(sectors, stacks)]
+        while len(tessellations) < levels:
+            coarser = (max(6, tessellations[-1][0] // 2), max(3, tessellations[-1][1] // 2))
+            if coarser == tessellations[-1]: break
+            tessellations.append(coarser)
+        return [load_sphere_mesh(radius, level_sectors, level_stacks) for level_sectors, level_stacks in tessellations]
+    key = ("sphere", radius, sectors, stacks, levels, None if thresholds is None else tuple(thresholds))
+    return _cached_lod_chain(key, build_meshes, thresholds)
+
+def load_lod_mesh(vertices, levels=4, ratio=0.5, thresholds=None) -> LODMesh:
+    """
+    Builds an LOD chain for an arbitrary mesh given as a de-indexed list of
+    pos(3), norm(3), uv(2) vertices. Each level keeps `ratio` of the triangles
+    of the level before it, simplified by quadric-error edge collapse. The chain
+    ends early once simplification stops removing triangles, and is memoized by
+    the vertex data and parameters.
+    """
+    _check_lod_parameters(levels, thresholds)
+    def build_meshes():
+        meshes = [Mesh(_calculate_tangents_and_bitangents(vertices))]
+        for level in range(1, levels):
+            simplified = lod.simplify_cached(vertices, ratio ** level)
+            if len(simplified) // 3 >= meshes[-1].triangle_count: break
+            meshes.append(Mesh(_calculate_tangents_and_bitangents(simplified)))
+        return meshes
+    digest = hashlib.sha1(np.ascontiguousarray(vertices, dtype=np.float32).tobytes()).hexdigest()
+    key = ("mesh", digest, levels, ratio, None if thresholds is None else tuple(thresholds))
+    return _cached_lod_chain(key, build_meshes, thresholds)
@@ -33,6 +33,13 @@ class Camera:
             self.fov, self.aspect_ratio, self.near_plane, self.far_plane
         )
 
+    def get_projected_size(self, center: Vector3, radius: float, viewport_height: int) -> float:
+        # Approximate on-screen diameter in pixels of a bounding sphere, using the
+        # vertical focal length of the perspective projection.
+        distance = max(float(vector.length(center - self.position)), self.near_plane)
+        focal_length = 1.0 / math.tan(math.radians(self.fov) / 2.0)
+        return radius * focal_length / distance * viewport_height
+
     def process_keyboard(self, direction: str, delta_time: float):
         velocity = self.movement_speed * delta_time
         
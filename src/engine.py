@@ -10,6 +10,8 @@ from mesh import Mesh
 import sys
 import re
 import ctypes
+import time
+from runtime_config import PROFILES, Profile, StartupReport
 
 def lerp(v1: Vector3, v2: Vector3, factor: float) -> Vector3:
     factor = max(0.0, min(1.0, factor))
@@ -17,15 +19,19 @@ def lerp(v1: Vector3, v2: Vector3, factor: float) -> Vector3:
 
 class Engine:
 
-    def __init__(self, width: int, height: int):
+    def __init__(self, width: int, height: int, profile: Profile = PROFILES["debug"], startup_report: StartupReport | None = None):
         
         self.width = width
         self.height = height
+        self.profile = profile
+        self.startup_report = startup_report
+        self.frame_times, self.frames_to_sample = [], 120
 
         self._initialize_pygame_and_opengl()
 
         self.clock = pygame.time.Clock()
         self.time = 0.0
+        self.frame_triangles, self.stats_timer = 0, 0.0
 
         self.camera = Camera(Vector3([0.0, 4.0, 15.0]), self.width / self.height)
         self.input_handler = InputHandler(self, self.camera)
@@ -37,7 +43,7 @@ class Engine:
 
         self.cube_mesh = asset_loader.load_cube_mesh()
         self.floor_mesh = asset_loader.load_quad_mesh()
-        self.sphere_mesh = asset_loader.load_sphere_mesh()
+        self.sphere_lod = asset_loader.load_sphere_lod()
         self.ui_quad_mesh = asset_loader.load_quad_mesh()
         # --- REVERT: Load skybox as a standard mesh ---
         self.skybox_mesh = asset_loader.load_cube_mesh()
@@ -54,14 +60,12 @@ class Engine:
             pygame.quit()
             sys.exit()
             
-        self.font = pygame.font.Font(None, 48)
+        # The font module and UI textures are only created the first time the UI is opened.
+        self.font = None
         self.input_text, self.text_dirty = "", False
         self.text_texture, self.text_texture_dims = None, (0,0)
-
-        prompt_surface = self.font.render("Enter Time (HH:MM):", True, (255,255,255))
-        self.prompt_texture,w,h = texture_loader.create_texture_from_surface(prompt_surface)
-        self.prompt_texture_dims = (w, h)
-        self.ui_bg_texture = texture_loader.generate_matte_texture(color=(0,0,0))
+        self.prompt_texture, self.prompt_texture_dims = None, (0,0)
+        self.ui_bg_texture = None
 
         self.running = False
         self.paused = False
@@ -72,14 +76,20 @@ class Engine:
         self.time_speed = 1440.0 / day_duration_seconds
 
         floor_scale, sun_scale = 100.0, 15.0
+        self.sun_radius, self.sun_lod_level = sun_scale, 0
         self.floor_model_matrix = matrix44.create_from_scale(Vector3([floor_scale,floor_scale,floor_scale]), dtype=np.float32)
         self.cube_model_matrix = matrix44.create_from_translation(Vector3([0.0, 2.5, 0.0]), dtype=np.float32)
         self.sun_model_matrix = matrix44.create_from_scale(Vector3([sun_scale, sun_scale, sun_scale]), dtype=np.float32)
         self.light_pos, self.light_color = Vector3([0.0, 0.0, 0.0]), Vector3([1.0, 1.0, 1.0])
         self.ambient_color, self.light_orbit_radius = Vector3([0.0, 0.0, 0.0]), floor_scale * 0.75
+        if self.startup_report: self.startup_report.mark("engine initialized")
 
     def _initialize_pygame_and_opengl(self) -> None:
-        pygame.init()
+        if self.profile.init_all_pygame_modules:
+            pygame.init()
+        else:
+            # Only the display is needed up front; it also brings up the event queue.
+            pygame.display.init()
         pygame.display.set_caption("Peace Engine v1.0")
         pygame.display.gl_set_attribute(pygame.GL_CONTEXT_MAJOR_VERSION, 3)
         pygame.display.gl_set_attribute(pygame.GL_CONTEXT_MINOR_VERSION, 3)
@@ -100,10 +110,32 @@ class Engine:
             self.input_handler.process_input(delta_time)
             if not self.paused:
                 self._update(delta_time)
+            # The buffer swap can block on vsync, so it is kept out of the measured render time.
+            render_start = time.perf_counter()
             self._render()
+            render_time = time.perf_counter() - render_start
+            pygame.display.flip()
+            self._record_startup_frame(render_time)
+            self._report_frame_stats(delta_time)
         self._cleanup()
 
+    def _record_startup_frame(self, render_time):
+        if not self.startup_report or len(self.frame_times) >= self.frames_to_sample: return
+        if not self.frame_times:
+            self.startup_report.mark("first frame"); self.startup_report.print_marks(self.profile.name)
+        self.frame_times.append(render_time)
+        if len(self.frame_times) == self.frames_to_sample: self.startup_report.print_frame_times(self.frame_times)
+
+    def _initialize_ui(self):
+        if not pygame.font.get_init(): pygame.font.init()
+        self.font = pygame.font.Font(None, 48)
+        prompt_surface = self.font.render("Enter Time (HH:MM):", True, (255,255,255))
+        self.prompt_texture,w,h = texture_loader.create_texture_from_surface(prompt_surface)
+        self.prompt_texture_dims = (w, h)
+        self.ui_bg_texture = texture_loader.generate_matte_texture(color=(0,0,0))
+
     def enter_time_set_mode(self):
+        if self.font is None: self._initialize_ui()
         self.paused = True; self.input_text = ""; self.text_dirty = True
         pygame.mouse.set_visible(True); pygame.event.set_grab(False); self.input_handler.first_mouse = True
     
@@ -129,6 +161,12 @@ class Engine:
         self.light_pos.z = np.sin(sun_angle) * self.light_orbit_radius
         self.light_pos.y = np.sin(time_ratio * np.pi) * (self.light_orbit_radius * 0.5) + 5.0
     
+    def _report_frame_stats(self, delta_time):
+        self.stats_timer += delta_time
+        if self.stats_timer >= 1.0:
+            self.stats_timer = 0.0
+            pygame.display.set_caption(f"Peace Engine v1.0 | {self.clock.get_fps():.0f} FPS | {self.frame_triangles} triangles/frame | sun LOD {self.sun_lod_level}")
+
     def _update_lighting_and_colors(self):
         time_ratio = self.current_time_minutes / 1440.0
         sunrise_color=Vector3([1.0,0.4,0.2]); noon_color=Vector3([1.0,1.0,0.9]); sunset_color=Vector3([1.0,0.4,0.2]); night_color=Vector3([0.6,0.7,0.9])
@@ -154,6 +192,7 @@ class Engine:
         self._update_lighting_and_colors()
         glViewport(0, 0, self.width, self.height)
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        self.frame_triangles = 0
         
         projection, view = self.camera.get_projection_matrix(), self.camera.get_view_matrix()
         
@@ -164,17 +203,19 @@ class Engine:
         self.lighting_shader.set_vec3("ambientColor", self.ambient_color); self.lighting_shader.set_int("objectTexture", 0)
         
         glActiveTexture(GL_TEXTURE0); glBindTexture(GL_TEXTURE_2D, self.container_texture)
-        self.lighting_shader.set_mat4("model", self.cube_model_matrix); self.cube_mesh.draw()
+        self.lighting_shader.set_mat4("model", self.cube_model_matrix); self.frame_triangles += self.cube_mesh.draw()
         
         glBindTexture(GL_TEXTURE_2D, self.floor_texture)
-        self.lighting_shader.set_mat4("model", self.floor_model_matrix); self.floor_mesh.draw()
+        self.lighting_shader.set_mat4("model", self.floor_model_matrix); self.frame_triangles += self.floor_mesh.draw()
         
         if self.sun_active:
             self.light_source_shader.use()
             sun_world_matrix = matrix44.multiply(matrix44.create_from_translation(self.light_pos), self.sun_model_matrix)
             self.light_source_shader.set_mat4("projection", projection); self.light_source_shader.set_mat4("view", view)
             self.light_source_shader.set_mat4("model", sun_world_matrix); self.light_source_shader.set_vec3("lightColor", self.light_color)
-            self.sphere_mesh.draw()
+            sun_screen_size = self.camera.get_projected_size(self.light_pos, self.sun_radius, self.height)
+            self.sun_lod_level = self.sphere_lod.select_level(sun_screen_size, self.sun_lod_level)
+            self.frame_triangles += self.sphere_lod.meshes[self.sun_lod_level].draw()
 
         glDepthFunc(GL_LEQUAL)
         glEnable(GL_CULL_FACE)
@@ -186,23 +227,25 @@ class Engine:
         glActiveTexture(GL_TEXTURE0); glBindTexture(GL_TEXTURE_CUBE_MAP, self.skybox_texture); self.skybox_shader.set_int("skybox", 0)
         
         # --- REVERT: Draw using the mesh object ---
-        self.skybox_mesh.draw()
+        self.frame_triangles += self.skybox_mesh.draw()
 
         glDisable(GL_CULL_FACE)
         glDepthFunc(GL_LESS)
         
         if self.paused: self._render_ui()
-        pygame.display.flip()
 
     def _render_ui(self):
         pass
 
     def _cleanup(self):
+        # Sessions shorter than the sampling window still report what they measured.
+        if self.startup_report and len(self.frame_times) < self.frames_to_sample: self.startup_report.print_frame_times(self.frame_times)
+
         valid_textures = [tex for tex in [self.container_texture, self.floor_texture, self.skybox_texture, self.prompt_texture, self.text_texture, self.ui_bg_texture] if tex is not None]
         if valid_textures: glDeleteTextures(len(valid_textures), valid_textures)
         
         self.lighting_shader.destroy(); self.skybox_shader.destroy(); self.light_source_shader.destroy(); self.ui_shader.destroy()
-        self.cube_mesh.destroy(); self.floor_mesh.destroy(); self.sphere_mesh.destroy(); self.ui_quad_mesh.destroy()
+        self.cube_mesh.destroy(); self.floor_mesh.destroy(); self.sphere_lod.destroy(); self.ui_quad_mesh.destroy()
         # --- REVERT: a dedicated VAO is no longer used ---
         self.skybox_mesh.destroy()
         
@@ -0,0 +1,298 @@
+# src/lod.py
+import hashlib
+import heapq
+from collections import OrderedDict
+import numpy as np
+
+class LODMesh:
+    """
+    A chain of progressively simplified meshes for the same object.
+    Level 0 is the full-detail mesh; each following level is coarser.
+    """
+    def __init__(self, meshes, thresholds, hysteresis=0.15):
+        """
+        Args:
+            meshes (list[Mesh]): Meshes ordered from finest to coarsest.
+            thresholds (list[float]): Projected sizes in pixels. Level i+1 is used
+            once the object's on-screen size drops below thresholds[i].
+            hysteresis (float): Fractional band around each threshold that has to be
+            crossed before the level changes, so objects do not pop back and forth.
+
+        The chain holds no per-object state, so one chain can be shared by every
+        object drawn with it; each object keeps its own current level.
+        """
+        if len(thresholds) != len(meshes) - 1:
+            raise ValueError("An LOD chain needs exactly one threshold between each pair of levels.")
+        self.meshes = meshes
+        self.thresholds = thresholds
+        self.hysteresis = hysteresis
+
+    def select_level(self, screen_size: float, previous_level: int = 0) -> int:
+        """
+        Picks the level for the given projected size in pixels, moving at most as
+        far as the hysteresis band allows from the level the object used last frame.
+        """
+        level = min(previous_level, len(self.thresholds))
+        while level < len(self.thresholds) and screen_size < self.thresholds[level] * (1.0 - self.hysteresis):
+            level += 1
+        while level > 0 and screen_size > self.thresholds[level - 1] * (1.0 + self.hysteresis):
+            level -= 1
+        return level
+
+    def destroy(self):
+        for mesh in self.meshes:
+            mesh.destroy()
+        self.meshes = []
+
+def default_thresholds(level_count: int) -> list[float]:
+    """
+    Switch sizes in pixels for a chain of `level_count` levels: 400 px for the
+    first step, then each further step at roughly a third of the previous one.
+    """
+    return [400.0 / 2.75 ** i for i in range(level_count - 1)]
+
+# Positions closer than this fraction of the bounding box diagonal are welded together.
+WELD_TOLERANCE = 1e-6
+
+def _weld_positions(vertices: np.ndarray):
+    """
+    Turns a de-indexed triangle list into unique positions and a face index array.
+    Positions are quantized before welding, so float noise such as sin(2*pi) on a
+    uv seam does not split the surface. Normals and uvs are left per corner, so hard
+    edges and uv seams still share topology.
+    """
+    points = vertices[:, 0:3]
+    extent = np.linalg.norm(points.max(axis=0) - points.min(axis=0)) if len(points) else 0.0
+    tolerance = max(extent * WELD_TOLERANCE, np.finfo(np.float64).tiny)
+    _, first, inverse = np.unique(np.round(points / tolerance), axis=0, return_index=True, return_inverse=True)
+    return points[first], inverse.reshape(-1, 3)
+
+def _uv_area(uvs):
+    return (uvs[1][0] - uvs[0][0]) * (uvs[2][1] - uvs[0][1]) - (uvs[2][0] - uvs[0][0]) * (uvs[1][1] - uvs[0][1])
+
+def _face_normal(positions, face):
+    a, b, c = positions[face[0]], positions[face[1]], positions[face[2]]
+    return np.cross(b - a, c - a)
+
+def _find(parents, i):
+    while parents[i] != i:
+        parents[i] = parents[parents[i]]
+        i = parents[i]
+    return i
+
+# Seam and boundary edges get extra planes perpendicular to their faces, weighted
+# so that sliding a seam vertex off its seam line is much more expensive than
+# flattening the surface.
+SEAM_WEIGHT = 100.0
+# A collapse is rejected if it turns any remaining triangle by more than about 75 degrees
+# from its previous or its original orientation,
+# or shrinks or mirrors its uv triangle to below this fraction of its previous uv area.
+MAX_FACE_ROTATION_DOT = 0.25
+MIN_UV_AREA_RATIO = 1e-3
+
+def simplify(vertices, target_ratio: float, crease_angle: float = 60.0) -> np.ndarray:
+    """
+    Simplifies a de-indexed triangle list using quadric-error edge collapse.
+
+    Topology is built from positions alone. An edge is a seam when the uvs differ
+    across it or the normals differ by more than `crease_angle` degrees; open edges
+    are seams too. A vertex on a single seam may only slide along it, and vertices
+    where seams meet or end are never moved. Each collapse moves one endpoint onto
+    the other, the moved corners take their uvs from the matching side of the kept
+    vertex, and normals are recomputed from the simplified faces within each
+    smooth region.
+
+    Args:
+        vertices: Sequence of [x, y, z, nx, ny, nz, u, v] rows, three per triangle.
+        target_ratio (float): Fraction of the original triangles to keep. The result
+        can have more triangles than this if the seam constraints stop it early.
+        crease_angle (float): Largest normal difference in degrees still treated as smooth.
+
+    Returns:
+        numpy.ndarray: The simplified triangle list in the same 8-float layout.
+    """
+    vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 8)
+    positions, faces = _weld_positions(vertices)
+    corners = vertices.reshape(-1, 3, 8)
+    valid = (faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 0] != faces[:, 2])
+    faces, corners = faces[valid].copy(), corners[valid]
+    vertex_count, face_count = len(positions), len(faces)
+    target = max(1, int(face_count * target_ratio))
+    min_normal_dot = np.cos(np.radians(crease_angle))
+
+    def slot(f, v):
+        return int(np.nonzero(faces[f] == v)[0][0])
+
+    edge_faces = {}
+    vertex_faces = [set() for _ in range(vertex_count)]
+    for f, face in enumerate(faces):
+        for i in range(3):
+            vertex_faces[face[i]].add(f)
+            edge = tuple(sorted((int(face[i]), int(face[(i + 1) % 3]))))
+            edge_faces.setdefault(edge, []).append(f)
+
+    # Classify edges and group the corners around each vertex into wedges: corners
+    # reachable from each other without crossing a seam share one uv and normal.
+    pinned = np.zeros(vertex_count, dtype=bool)
+    seam_neighbours = [set() for _ in range(vertex_count)]
+    seam_edges = []
+    parents = list(range(face_count * 3))
+    for (a, b), adjacent in edge_faces.items():
+        if len(adjacent) > 2:
+            pinned[a] = pinned[b] = True
+            continue
+        is_seam = len(adjacent) == 1
+        if not is_seam:
+            f, g = adjacent
+            for v in (a, b):
+                cf, cg = corners[f, slot(f, v)], corners[g, slot(g, v)]
+                if not np.allclose(cf[6:8], cg[6:8], atol=1e-6) or np.dot(cf[3:6], cg[3:6]) < min_normal_dot * np.linalg.norm(cf[3:6]) * np.linalg.norm(cg[3:6]):
+                    is_seam = True
+            if not is_seam:
+                for v in (a, b):
+                    root_f, root_g = _find(parents, f * 3 + slot(f, v)), _find(parents, g * 3 + slot(g, v))
+                    parents[root_f] = root_g
+        if is_seam:
+            seam_neighbours[a].add(b); seam_neighbours[b].add(a)
+            seam_edges.append((a, b, adjacent))
+
+    roots = np.array([_find(parents, c) for c in range(face_count * 3)])
+    wedge_roots, corner_wedge = np.unique(roots, return_inverse=True)
+    corner_wedge = corner_wedge.reshape(-1, 3)
+    wedge_uvs = corners.reshape(-1, 8)[wedge_roots, 6:8]
+    wedge_source_normals = corners.reshape(-1, 8)[wedge_roots, 3:6]
+
+    # Fundamental error quadric of every face plus the seam planes, accumulated per vertex.
+    quadrics = np.zeros((vertex_count, 4, 4))
+    face_normals = np.zeros((face_count, 3))
+    for f, face in enumerate(faces):
+        normal = _face_normal(positions, face)
+        length = np.linalg.norm(normal)
+        if length > 0.0:
+            face_normals[f] = normal / length
+            plane = np.append(face_normals[f], -np.dot(face_normals[f], positions[face[0]]))
+            quadric = np.outer(plane, plane)
+            for v in face: quadrics[v] += quadric
+    for a, b, adjacent in seam_edges:
+        for f in adjacent:
+            direction = np.cross(positions[b] - positions[a], face_normals[f])
+            length = np.linalg.norm(direction)
+            if length > 0.0:
+                direction /= length
+                plane = np.append(direction, -np.dot(direction, positions[a]))
+                quadric = SEAM_WEIGHT * np.outer(plane, plane)
+                quadrics[a] += quadric; quadrics[b] += quadric
+
+    def can_move(removed, kept):
+        if pinned[removed]: return False
+        seams = seam_neighbours[removed]
+        return not seams or (len(seams) == 2 and kept in seams)
+
+    version = np.zeros(vertex_count, dtype=np.int64)
+    heap = []
+    def push_edge(a, b):
+        quadric = quadrics[a] + quadrics[b]
+        for removed, kept in ((a, b), (b, a)):
+            if can_move(removed, kept):
+                p = np.append(positions[kept], 1.0)
+                heapq.heappush(heap, (float(p @ quadric @ p), removed, kept, version[removed], version[kept]))
+
+    for a, b in edge_faces: push_edge(a, b)
+
+    def neighbours(v):
+        return {int(w) for f in vertex_faces[v] for w in faces[f]} - {v}
+
+    alive = np.ones(face_count, dtype=bool)
+    while face_count > target and heap:
+        cost, removed, kept, removed_version, kept_version = heapq.heappop(heap)
+        if version[removed] != removed_version or version[kept] != kept_version: continue
+        if not can_move(removed, kept): continue
+
+        shared = vertex_faces[removed] & vertex_faces[kept]
+        moved = vertex_faces[removed] - shared
+        if not shared: continue
+        # Link condition: the endpoints may only share the neighbours across their
+        # shared faces, otherwise the collapse pinches the surface into a non-manifold.
+        opposite = {int(w) for f in shared for w in faces[f]} - {removed, kept}
+        if neighbours(removed) & neighbours(kept) != opposite: continue
+
+        # Each wedge of the removed vertex takes over the wedge of the kept vertex on the same side.
+        wedge_map, consistent = {}, True
+        for f in shared:
+            source, destination = corner_wedge[f, slot(f, removed)], corner_wedge[f, slot(f, kept)]
+            if wedge_map.setdefault(source, destination) != destination: consistent = False
+        if not consistent or any(corner_wedge[f, slot(f, removed)] not in wedge_map for f in moved): continue
+
+        # Reject collapses that would fold or degenerate a neighbouring triangle, in
+        # space or in uv, since a zero-area uv triangle has no defined tangent frame.
+        broken = False
+        for f in moved:
+            before = _face_normal(positions, faces[f])
+            after = _face_normal(positions, np.where(faces[f] == removed, kept, faces[f]))
+            before_length, after_length = np.linalg.norm(before), np.linalg.norm(after)
+            if after_length <= 1e-6 * before_length or np.dot(before, after) < MAX_FACE_ROTATION_DOT * before_length * after_length:
+                broken = True
+                break
+            # Also measure against the source face, so small turns cannot add up to a fold.
+            if np.any(face_normals[f]) and np.dot(face_normals[f], after) < MAX_FACE_ROTATION_DOT * after_length:
+                broken = True
+                break
+            before_uv = _uv_area(wedge_uvs[corner_wedge[f]])
+            after_uv = _uv_area(wedge_uvs[[wedge_map.get(w, w) if v == removed else w for v, w in zip(faces[f], corner_wedge[f])]])
+            if before_uv != 0.0 and after_uv / before_uv < MIN_UV_AREA_RATIO:
+                broken = True
+                break
+        if broken: continue
+
+        for f in shared:
+            alive[f] = False
+            face_count -= 1
+            for v in faces[f]: vertex_faces[v].discard(f)
+        for f in moved:
+            i = slot(f, removed)
+            corner_wedge[f, i] = wedge_map[corner_wedge[f, i]]
+            faces[f, i] = kept
+            vertex_faces[kept].add(f)
+        vertex_faces[removed] = set()
+        for v in seam_neighbours[removed]:
+            seam_neighbours[v].discard(removed)
+            if v != kept:
+                seam_neighbours[v].add(kept); seam_neighbours[kept].add(v)
+        seam_neighbours[removed] = set()
+        quadrics[kept] += quadrics[removed]
+        version[removed] += 1
+        version[kept] += 1
+
+        for v in neighbours(kept): push_edge(kept, v)
+
+    # Rebuild smooth normals per wedge from the area-weighted simplified faces.
+    faces, corner_wedge = faces[alive], corner_wedge[alive]
+    wedge_normals = np.zeros((len(wedge_roots), 3))
+    for face, wedges in zip(faces, corner_wedge):
+        normal = _face_normal(positions, face)
+        for w in wedges: wedge_normals[w] += normal
+    # Keep the side the source normals point to, even where the triangle winding disagrees with them.
+    wedge_normals *= np.where(np.einsum('ij,ij->i', wedge_normals, wedge_source_normals) < 0.0, -1.0, 1.0)[:, None]
+    lengths = np.linalg.norm(wedge_normals, axis=1, keepdims=True)
+    wedge_normals /= np.where(lengths > 0.0, lengths, 1.0)
+
+    flat_faces, flat_wedges = faces.reshape(-1), corner_wedge.reshape(-1)
+    return np.hstack([positions[flat_faces], wedge_normals[flat_wedges], wedge_uvs[flat_wedges]])
+
+SIMPLIFY_CACHE_SIZE = 32
+_simplify_cache = OrderedDict()
+
+def simplify_cached(vertices, target_ratio: float) -> np.ndarray:
+    """
+    Memoized front end to simplify(), keyed by a digest of the source vertex data
+    and the ratio, so identical meshes only pay for simplification once. Keeps the
+    SIMPLIFY_CACHE_SIZE most recently used results.
+    """
+    data = np.ascontiguousarray(vertices, dtype=np.float32)
+    key = (hashlib.sha1(data.tobytes()).hexdigest(), data.shape, target_ratio)
+    if key in _simplify_cache:
+        _simplify_cache.move_to_end(key)
+    else:
+        _simplify_cache[key] = simplify(data, target_ratio).astype(np.float32)
+        if len(_simplify_cache) > SIMPLIFY_CACHE_SIZE: _simplify_cache.popitem(last=False)
+    return _simplify_cache[key]
@@ -16,6 +16,7 @@ class Mesh:
         """
         # 14 floats per vertex (3+3+2+3+3)
         self.vert_count = len(vertices) // 14
+        self.triangle_count = self.vert_count // 3
 
         self.vao = glGenVertexArrays(1)
         glBindVertexArray(self.vao)
@@ -49,10 +50,11 @@ class Mesh:
 
         glBindVertexArray(0)
 
-    def draw(self):
+    def draw(self) -> int:
         glBindVertexArray(self.vao)
         glDrawArrays(GL_TRIANGLES, 0, self.vert_count)
         glBindVertexArray(0)
+        return self.triangle_count
 
     def destroy(self):
         glDeleteVertexArrays(1, (self.vao,))
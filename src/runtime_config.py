@@ -0,0 +1,79 @@
+# src/runtime_config.py
+import os
+import sys
+import time
+
+class Profile:
+    """
+    A named set of startup options. A PyOpenGL flag left as None keeps the
+    library's own default. The debug profile keeps those defaults and initializes
+    every pygame module; the production profile trades PyOpenGL's safety nets
+    for a faster cold start and cheaper GL calls in the hot path.
+    """
+    def __init__(self, name: str, gl_error_checking: bool | None, gl_error_logging: bool | None, gl_context_checking: bool | None, init_all_pygame_modules: bool):
+        self.name = name
+        self.gl_error_checking = gl_error_checking
+        self.gl_error_logging = gl_error_logging
+        self.gl_context_checking = gl_context_checking
+        self.init_all_pygame_modules = init_all_pygame_modules
+
+PROFILES = {
+    "debug": Profile("debug", gl_error_checking=None, gl_error_logging=None, gl_context_checking=None, init_all_pygame_modules=True),
+    "production": Profile("production", gl_error_checking=False, gl_error_logging=False, gl_context_checking=False, init_all_pygame_modules=False),
+}
+
+def select_profile(argv: list[str]) -> Profile:
+    """
+    Picks the profile from a --debug/--production command line flag, falling back
+    to the PEACE_PROFILE environment variable and then to debug.
+    """
+    name = os.environ.get("PEACE_PROFILE", "debug")
+    for arg in argv:
+        if arg.startswith("--") and arg[2:] in PROFILES:
+            name = arg[2:]
+    if name not in PROFILES:
+        raise ValueError(f"Unknown profile '{name}'. Expected one of: {', '.join(PROFILES)}")
+    return PROFILES[name]
+
+def apply_opengl_flags(profile: Profile) -> None:
+    """
+    Configures PyOpenGL for the profile. These flags are read when OpenGL.GL is
+    first imported, so this has to run before any module that imports it. A flag
+    the user already set through its PYOPENGL_* environment variable is left alone.
+    """
+    if "OpenGL.GL" in sys.modules:
+        raise RuntimeError("PyOpenGL flags must be set before OpenGL.GL is imported.")
+    import OpenGL
+    flags = {
+        "ERROR_CHECKING": profile.gl_error_checking,
+        "ERROR_LOGGING": profile.gl_error_logging,
+        "CONTEXT_CHECKING": profile.gl_context_checking,
+    }
+    for flag, value in flags.items():
+        if value is not None and f"PYOPENGL_{flag}" not in os.environ:
+            setattr(OpenGL, flag, value)
+
+class StartupReport:
+    """
+    Records named timestamps from process start to the first frame, plus the
+    render CPU time of the first frames, so the cold-start and per-frame cost of
+    each profile can be compared.
+    """
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.marks = []
+
+    def mark(self, label: str) -> None:
+        self.marks.append((label, time.perf_counter()))
+
+    def print_marks(self, profile_name: str) -> None:
+        print(f"\n--- Startup report ({profile_name} profile) ---")
+        previous = self.start
+        for label, timestamp in self.marks:
+            print(f"{label:<24}{(timestamp - previous) * 1000.0:9.1f} ms  (total {(timestamp - self.start) * 1000.0:9.1f} ms)")
+            previous = timestamp
+
+    def print_frame_times(self, frame_times: list[float]) -> None:
+        if frame_times:
+            mean = sum(frame_times) / len(frame_times) * 1000.0
+            print(f"{'mean render CPU time':<24}{mean:9.2f} ms  over {len(frame_times)} frames (excluding buffer swap)")